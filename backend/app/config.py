@@ -4,12 +4,18 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "postgresql://localhost/ramadan_db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20  # pool + overflow = 40, FastAPI's sync threadpool size
+    DB_POOL_RECYCLE: int = 1800  # seconds
 
     # JWT
     JWT_SECRET_KEY: str = "change-me"
     JWT_ACCESS_TOKEN_EXPIRES: int = 3600  # 1 hour in seconds
     JWT_ALGORITHM: str = "HS256"
 
+    # Password hashing (bcrypt work factor)
+    BCRYPT_ROUNDS: int = 12
+
     # Mail
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_PORT: int = 587
@@ -1,34 +1,49 @@
-from datetime import datetime, timedelta, timezone
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.config import settings
 from app.database import get_db
+from app.models.user import User
+from app.models.halqa import Halqa
 
 security = HTTPBearer(auto_error=False)
 
+# Built once instead of per request; tokens must carry both exp and sub.
+_JWT_ALGORITHMS = (settings.JWT_ALGORITHM,)
+_JWT_DECODE_OPTIONS = {"require_exp": True, "require_sub": True}
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ):
     """Decode JWT and return the current user."""
-    from app.models.user import User
-
     if credentials is None:
         raise HTTPException(status_code=401, detail="التوكن مطلوب")
 
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS,
+        )
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="التوكن غير صالح")
     except JWTError:
         raise HTTPException(status_code=401, detail="التوكن غير صالح أو منتهي الصلاحية")
 
-    user = db.get(User, int(user_id))
+    # Load the user's halqa and its supervisor in the same SELECT; profile and
+    # stats responses read them right away.
+    user = db.get(
+        User,
+        int(user_id),
+        options=[joinedload(User.halqa).joinedload(Halqa.supervisor)],
+    )
     if not user:
         raise HTTPException(status_code=404, detail="المستخدم غير موجود")
     return user
@@ -45,7 +60,7 @@ class RoleChecker:
     """Callable dependency for role-based access."""
 
     def __init__(self, *allowed_roles: str):
-        self.allowed_roles = allowed_roles
+        self.allowed_roles = frozenset(allowed_roles)
 
     def __call__(self, user=Depends(get_current_user)):
         if user.status != "active" and user.role != "super_admin":
@@ -57,6 +72,6 @@ class RoleChecker:
 
 def create_access_token(user_id: int) -> str:
     """Create a JWT access token."""
-    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.JWT_ACCESS_TOKEN_EXPIRES)
+    expire = int(time.time()) + settings.JWT_ACCESS_TOKEN_EXPIRES
     payload = {"sub": str(user_id), "exp": expire}
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
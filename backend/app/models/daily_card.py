@@ -1,5 +1,8 @@
+import operator
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, Text, Date, DateTime, ForeignKey, UniqueConstraint
+from functools import reduce
+from sqlalchemy import Column, Integer, Float, Text, Date, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -43,14 +46,26 @@ class DailyCard(Base):
         "rawatib", "main_lesson", 
         "enrichment_lesson", "charity_worship", "extra_work",
     ]
+    MAX_SCORE = len(SCORE_FIELDS) * 10  # 120
 
-    @property
+    # Reads all score attributes in one call, returning a tuple
+    _score_values = operator.attrgetter(*SCORE_FIELDS)
+
+    @hybrid_property
     def total_score(self):
-        return sum(getattr(self, field, 0) or 0 for field in self.SCORE_FIELDS)
+        return sum(v or 0 for v in DailyCard._score_values(self))
+
+    @total_score.expression
+    def total_score(cls):
+        # SQL side: COALESCE(quran, 0) + COALESCE(tadabbur, 0) + ...
+        return reduce(
+            operator.add,
+            (func.coalesce(getattr(cls, field), 0) for field in cls.SCORE_FIELDS),
+        )
 
     @property
     def max_score(self):
-        return len(self.SCORE_FIELDS) * 10  # 110
+        return self.MAX_SCORE
 
     @property
     def percentage(self):
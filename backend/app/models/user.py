@@ -1,10 +1,17 @@
 from datetime import datetime
+import bcrypt
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from passlib.hash import bcrypt as bcrypt_hash
+from app.config import settings
 from app.database import Base
 
 
+def hash_password(password: str) -> str:
+    """Return a bcrypt hash of the given password."""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
 class User(Base):
     """User model for participants, supervisors, and admins."""
 
@@ -41,7 +48,7 @@ class User(Base):
     )
 
     def set_password(self, password: str):
-        self.password_hash = bcrypt_hash.hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return bcrypt_hash.verify(password, self.password_hash)
+        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
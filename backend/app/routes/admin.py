@@ -3,10 +3,11 @@ from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from fastapi.responses import StreamingResponse, Response
 from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.config import settings as app_settings
-from app.models.user import User
+from app.models.user import User, hash_password
 from app.models.daily_card import DailyCard
 from app.models.halqa import Halqa
 from app.dependencies import RoleChecker
@@ -14,11 +15,14 @@ from typing import List
 from pydantic import BaseModel
 from app.schemas.user import (
     AdminUserUpdate, AdminResetPassword, SetRole,
-    AssignHalqa, RejectRegistration, user_to_response,
+    AssignHalqa, RejectRegistration, USER_RESPONSE_OPTIONS, user_to_response,
 )
 from sqlalchemy import func
-from app.schemas.halqa import HalqaCreate, HalqaUpdate, AssignMembers, halqa_to_response
+from app.schemas.halqa import (
+    HalqaCreate, HalqaUpdate, AssignMembers, HALQA_RESPONSE_OPTIONS, halqa_to_response,
+)
 from app.schemas.daily_card import card_to_response
+from app.utils.scores import score_totals_by_user
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -36,9 +40,12 @@ def get_registrations(
 ):
     """Get all pending registrations."""
     if status == "all":
-        users = db.query(User).order_by(User.created_at.desc()).all()
+        users = db.query(User).options(*USER_RESPONSE_OPTIONS).order_by(User.created_at.desc()).all()
     else:
-        users = db.query(User).filter_by(status=status).order_by(User.created_at.desc()).all()
+        users = (
+            db.query(User).options(*USER_RESPONSE_OPTIONS)
+            .filter_by(status=status).order_by(User.created_at.desc()).all()
+        )
     return {"users": [user_to_response(u) for u in users]}
 
 
@@ -89,7 +96,7 @@ def get_all_users(
     db: Session = Depends(get_db),
 ):
     """Get all users with optional filters."""
-    query = db.query(User)
+    query = db.query(User).options(*USER_RESPONSE_OPTIONS)
 
     if status:
         query = query.filter_by(status=status)
@@ -235,7 +242,7 @@ def get_halqas(
     db: Session = Depends(get_db),
 ):
     """Get all halqas."""
-    halqas = db.query(Halqa).all()
+    halqas = db.query(Halqa).options(*HALQA_RESPONSE_OPTIONS).all()
     return {"halqas": [halqa_to_response(h) for h in halqas]}
 
 
@@ -318,11 +325,9 @@ def assign_members_to_halqa(
     if not halqa:
         raise HTTPException(404, detail="الحلقة غير موجودة")
 
-    for uid in data.user_ids:
-        user = db.get(User, uid)
-        if user:
-            user.halqa_id = halqa_id
-
+    db.query(User).filter(User.id.in_(data.user_ids)).update(
+        {"halqa_id": halqa_id}, synchronize_session=False
+    )
     db.commit()
     return {"message": "تم تعيين المشاركين"}
 
@@ -363,7 +368,9 @@ def _build_analytics_results(
     sort_order: str = "desc",
 ):
     """Shared helper for analytics and export."""
-    query = db.query(User).filter_by(status="active")
+    query = db.query(User).options(
+        joinedload(User.halqa).joinedload(Halqa.supervisor)
+    ).filter_by(status="active")
 
     if gender:
         query = query.filter_by(gender=gender)
@@ -397,26 +404,20 @@ def _build_analytics_results(
         end_date = date.fromisoformat(date_to)
 
     # Calculate max based on total days in range (not just submitted cards)
-    max_per_day = len(DailyCard.SCORE_FIELDS) * 10  # 110
     total_days = None
     if start_date:
         range_end = end_date or today
         total_days = (range_end - start_date).days + 1
 
+    totals = score_totals_by_user(db, [u.id for u in users], start_date, end_date)
+
     results = []
     for u in users:
-        card_query = db.query(DailyCard).filter_by(user_id=u.id)
-        if start_date:
-            card_query = card_query.filter(DailyCard.date >= start_date)
-        if end_date:
-            card_query = card_query.filter(DailyCard.date <= end_date)
-
-        cards = card_query.all()
-        total = sum(c.total_score for c in cards)
+        total, cards_count = totals.get(u.id, (0, 0))
         if total_days:
-            max_total = total_days * max_per_day
+            max_total = total_days * DailyCard.MAX_SCORE
         else:
-            max_total = sum(c.max_score for c in cards) if cards else 0
+            max_total = cards_count * DailyCard.MAX_SCORE
         pct = round((total / max_total) * 100, 1) if max_total > 0 else 0
 
         if min_pct is not None and pct < min_pct:
@@ -434,7 +435,7 @@ def _build_analytics_results(
             "total_score": total,
             "max_score": max_total,
             "percentage": pct,
-            "cards_count": len(cards),
+            "cards_count": cards_count,
         })
 
     if sort_by == "name":
@@ -473,9 +474,16 @@ def get_analytics(
         date_from=date_from, date_to=date_to, sort_by=sort_by, sort_order=sort_order,
     )
 
-    total_active = db.query(User).filter_by(status="active").count()
-    total_pending = db.query(User).filter_by(status="pending").count()
-    total_halqas = db.query(Halqa).count()
+    # Count active and pending users in one grouped query
+    status_counts = dict(
+        db.query(User.status, func.count(User.id))
+        .filter(User.status.in_(("active", "pending")))
+        .group_by(User.status)
+        .all()
+    )
+    total_active = status_counts.get("active", 0)
+    total_pending = status_counts.get("pending", 0)
+    total_halqas = db.query(func.count(Halqa.id)).scalar()
 
     return {
         "results": results,
@@ -618,58 +626,92 @@ def import_users(
     max_mid = db.query(func.max(User.member_id)).scalar()
     next_member_id = (max_mid + 1) if max_mid else 1000
 
-    imported = 0
-    errors = []
-    seen_emails = set()
-
+    rows = []
     for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
         # Skip completely empty rows
         if all(cell is None or str(cell).strip() == "" for cell in row):
             continue
         row_data = dict(zip(headers, row))
+        raw_email = row_data.get("البريد")
+        email = str(raw_email).lower().strip() if raw_email is not None else ""
+        rows.append((row_idx, row_data, email))
+
+    # Check every email in the file against the database in one query
+    file_emails = {email for _, _, email in rows if email and email != "none"}
+    registered_emails = set()
+    if file_emails:
+        registered_emails = {
+            e for (e,) in db.query(User.email).filter(User.email.in_(file_emails))
+        }
+
+    # All imported accounts share the default password, so hash it once
+    default_password_hash = hash_password("123456")  # Default password
+
+    new_users = []
+    errors = []
+    seen_emails = set()
+
+    for row_idx, row_data, email in rows:
         try:
-            raw_email = row_data.get("البريد")
-            email = str(raw_email).lower().strip() if raw_email is not None else ""
             if not email or email == "none":
                 errors.append(f"صف {row_idx}: البريد فارغ")
                 continue
             if email in seen_emails:
                 errors.append(f"صف {row_idx}: بريد مكرر في الملف")
                 continue
-            if db.query(User).filter_by(email=email).first():
+            if email in registered_emails:
                 errors.append(f"صف {row_idx}: البريد مسجل مسبقاً ({email})")
                 continue
 
-            seen_emails.add(email)
             raw_gender = str(row_data.get("الجنس", "")).strip()
             gender_map = {"ذكر": "male", "أنثى": "female", "male": "male", "female": "female"}
             gender = gender_map.get(raw_gender, raw_gender)
 
             raw_age = row_data.get("العمر", 0)
             age = int(raw_age) if raw_age is not None and str(raw_age).strip() else 0
+            if not 0 <= age <= 150:
+                errors.append(f"صف {row_idx}: العمر غير صالح")
+                continue
 
-            user = User(
+            fields = {
+                "full_name": str(row_data.get("الاسم") or "").strip(),
+                "gender": gender,
+                "phone": str(row_data.get("الهاتف") or "").strip(),
+                "email": email,
+                "country": str(row_data.get("الدولة") or "").strip(),
+            }
+            too_long = [
+                name for name, value in fields.items()
+                if len(value) > User.__table__.c[name].type.length
+            ]
+            if too_long:
+                errors.append(f"صف {row_idx}: قيمة طويلة جداً ({', '.join(too_long)})")
+                continue
+
+            seen_emails.add(email)
+            new_users.append(User(
                 member_id=next_member_id,
-                full_name=str(row_data.get("الاسم") or "").strip(),
-                gender=gender,
                 age=age,
-                phone=str(row_data.get("الهاتف") or "").strip(),
-                email=email,
-                country=str(row_data.get("الدولة") or "").strip(),
                 referral_source=str(row_data.get("المصدر") or "").strip(),
+                password_hash=default_password_hash,
                 status="pending",
                 role="participant",
-            )
-            user.set_password("123456")  # Default password
-            db.add(user)
-            db.flush()
+                **fields,
+            ))
             next_member_id += 1
-            imported += 1
         except Exception as e:
-            db.rollback()
             errors.append(f"صف {row_idx}: {str(e)}")
 
-    db.commit()
+    # Single flush: SQLAlchemy sends the INSERTs as multi-row batches
+    db.add_all(new_users)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Rows are validated above; a clash here means a concurrent
+        # registration took the same email or member_id
+        db.rollback()
+        raise HTTPException(400, detail="تعارض مع تسجيل متزامن، يرجى إعادة الاستيراد")
+    imported = len(new_users)
     return {
         "message": f"تم استيراد {imported} مشارك في قائمة الانتظار",
         "errors": errors,
@@ -722,13 +764,9 @@ def bulk_approve(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    count = 0
-    for uid in data.user_ids:
-        u = db.get(User, uid)
-        if u and u.status == "pending":
-            u.status = "active"
-            u.rejection_note = None
-            count += 1
+    count = db.query(User).filter(
+        User.id.in_(data.user_ids), User.status == "pending"
+    ).update({"status": "active", "rejection_note": None}, synchronize_session=False)
     db.commit()
     return {"message": f"تم قبول {count} طلب"}
 
@@ -739,12 +777,9 @@ def bulk_reject(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    count = 0
-    for uid in data.user_ids:
-        u = db.get(User, uid)
-        if u and u.status == "pending":
-            u.status = "rejected"
-            count += 1
+    count = db.query(User).filter(
+        User.id.in_(data.user_ids), User.status == "pending"
+    ).update({"status": "rejected"}, synchronize_session=False)
     db.commit()
     return {"message": f"تم رفض {count} طلب"}
 
@@ -755,12 +790,9 @@ def bulk_activate(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    count = 0
-    for uid in data.user_ids:
-        u = db.get(User, uid)
-        if u and u.status in ("rejected", "withdrawn"):
-            u.status = "active"
-            count += 1
+    count = db.query(User).filter(
+        User.id.in_(data.user_ids), User.status.in_(("rejected", "withdrawn"))
+    ).update({"status": "active"}, synchronize_session=False)
     db.commit()
     return {"message": f"تم تفعيل {count} مشارك"}
 
@@ -771,12 +803,9 @@ def bulk_withdraw(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    count = 0
-    for uid in data.user_ids:
-        u = db.get(User, uid)
-        if u and u.status == "active":
-            u.status = "withdrawn"
-            count += 1
+    count = db.query(User).filter(
+        User.id.in_(data.user_ids), User.status == "active"
+    ).update({"status": "withdrawn"}, synchronize_session=False)
     db.commit()
     return {"message": f"تم سحب {count} مشارك"}
 
@@ -787,12 +816,9 @@ def bulk_assign_halqa(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    count = 0
-    for uid in data.user_ids:
-        u = db.get(User, uid)
-        if u:
-            u.halqa_id = data.halqa_id
-            count += 1
+    count = db.query(User).filter(
+        User.id.in_(data.user_ids)
+    ).update({"halqa_id": data.halqa_id}, synchronize_session=False)
     db.commit()
     return {"message": f"تم تعيين الحلقة لـ {count} مشارك"}
 
@@ -814,7 +840,7 @@ def export_users(
     import csv
     from openpyxl import Workbook
 
-    query = db.query(User)
+    query = db.query(User).options(joinedload(User.halqa).joinedload(Halqa.supervisor))
     if status:
         query = query.filter_by(status=status)
     if gender:
@@ -1,20 +1,21 @@
 import io
+from collections import defaultdict
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.user import User
 from app.models.daily_card import DailyCard
 from app.models.halqa import Halqa
 from app.dependencies import RoleChecker
-from app.schemas.user import user_to_response
+from app.schemas.user import USER_RESPONSE_OPTIONS, user_to_response
 from app.schemas.daily_card import DailyCardCreate, card_to_response
-from app.schemas.halqa import halqa_to_response
+from app.schemas.halqa import HALQA_RESPONSE_OPTIONS, halqa_to_response
+from app.utils.scores import score_totals_by_user
 
 router = APIRouter(prefix="/api/supervisor", tags=["supervisor"])
 
-MAX_PER_DAY = len(DailyCard.SCORE_FIELDS) * 10  # 110
 RAMADAN_START = date(2026, 2, 19)
 RAMADAN_END = date(2026, 3, 19)
 
@@ -40,12 +41,18 @@ def _resolve_halqa(user, db, halqa_id=None):
     return halqa
 
 
-def _get_members(db, halqa):
+def _get_members(db, halqa, options=USER_RESPONSE_OPTIONS):
     """Get active members for a halqa, or all active users if halqa is None (super_admin)."""
     if halqa:
-        return db.query(User).filter_by(halqa_id=halqa.id, status="active").all()
+        return (
+            db.query(User).options(*options)
+            .filter_by(halqa_id=halqa.id, status="active").all()
+        )
     # Super admin sees all active users (including supervisors and unassigned)
-    return db.query(User).filter(User.status == "active", User.role != "super_admin").all()
+    return (
+        db.query(User).options(*options)
+        .filter(User.status == "active", User.role != "super_admin").all()
+    )
 
 
 def _verify_member_access(user, member_id, db):
@@ -68,7 +75,7 @@ def get_all_halqas(
 ):
     """Get halqas available to this user. Super admin sees all, supervisor sees own."""
     if user.role == "super_admin":
-        halqas = db.query(Halqa).all()
+        halqas = db.query(Halqa).options(*HALQA_RESPONSE_OPTIONS).all()
     else:
         halqa = db.query(Halqa).filter_by(supervisor_id=user.id).first()
         halqas = [halqa] if halqa else []
@@ -180,16 +187,17 @@ def get_leaderboard(
 ):
     """Get leaderboard. Super admin can filter by halqa or see all."""
     halqa = _resolve_halqa(user, db, halqa_id)
-    members = _get_members(db, halqa)
+    members = _get_members(db, halqa, options=(joinedload(User.halqa),))
 
     today = date.today()
     elapsed_days = max((min(today, RAMADAN_END) - RAMADAN_START).days + 1, 1)
 
+    totals = score_totals_by_user(db, [m.id for m in members])
+    max_total = elapsed_days * DailyCard.MAX_SCORE
+
     leaderboard = []
     for m in members:
-        cards = db.query(DailyCard).filter_by(user_id=m.id).all()
-        total = sum(c.total_score for c in cards)
-        max_total = elapsed_days * MAX_PER_DAY
+        total, cards_count = totals.get(m.id, (0, 0))
         pct = round((total / max_total) * 100, 1) if max_total > 0 else 0
         leaderboard.append({
             "user_id": m.id,
@@ -199,7 +207,7 @@ def get_leaderboard(
             "halqa_name": m.halqa.name if m.halqa else "-",
             "total_score": total,
             "percentage": pct,
-            "cards_count": len(cards),
+            "cards_count": cards_count,
         })
 
     leaderboard.sort(key=lambda x: x["total_score"], reverse=True)
@@ -226,11 +234,22 @@ def get_daily_summary(
     halqa = _resolve_halqa(user, db, halqa_id)
     members = _get_members(db, halqa)
 
+    # Fetch every member's card for the day in one query
+    member_ids = [m.id for m in members]
+    cards_by_user = {}
+    if member_ids:
+        cards_by_user = {
+            c.user_id: c
+            for c in db.query(DailyCard).filter(
+                DailyCard.user_id.in_(member_ids), DailyCard.date == target_date
+            )
+        }
+
     submitted = []
     not_submitted = []
 
     for member in members:
-        card = db.query(DailyCard).filter_by(user_id=member.id, date=target_date).first()
+        card = cards_by_user.get(member.id)
         if card:
             submitted.append({
                 "member": user_to_response(member),
@@ -266,23 +285,18 @@ def get_range_summary(
 
     halqa = _resolve_halqa(user, db, halqa_id)
     members = _get_members(db, halqa)
+    totals = score_totals_by_user(db, [m.id for m in members], start, end)
+    max_total = total_days * DailyCard.MAX_SCORE
     summary = []
 
     for member in members:
-        cards = db.query(DailyCard).filter(
-            DailyCard.user_id == member.id,
-            DailyCard.date >= start,
-            DailyCard.date <= end,
-        ).all()
-
-        total = sum(c.total_score for c in cards)
-        max_total = total_days * MAX_PER_DAY
+        total, cards_count = totals.get(member.id, (0, 0))
         pct = round((total / max_total) * 100, 1) if max_total > 0 else 0
 
         sup = member.halqa.supervisor if member.halqa and member.halqa.supervisor else None
         summary.append({
             "member": user_to_response(member),
-            "cards_submitted": len(cards),
+            "cards_submitted": cards_count,
             "total_days": total_days,
             "total_score": total,
             "percentage": pct,
@@ -316,21 +330,16 @@ def get_weekly_summary(
     summary = []
 
     week_days = (today - week_start).days + 1
+    totals = score_totals_by_user(db, [m.id for m in members], week_start, today)
+    max_total = week_days * DailyCard.MAX_SCORE
 
     for member in members:
-        cards = db.query(DailyCard).filter(
-            DailyCard.user_id == member.id,
-            DailyCard.date >= week_start,
-            DailyCard.date <= today,
-        ).all()
-
-        total = sum(c.total_score for c in cards)
-        max_total = week_days * MAX_PER_DAY
+        total, cards_count = totals.get(member.id, (0, 0))
         pct = round((total / max_total) * 100, 1) if max_total > 0 else 0
 
         summary.append({
             "member": user_to_response(member),
-            "cards_submitted": len(cards),
+            "cards_submitted": cards_count,
             "total_score": total,
             "percentage": pct,
         })
@@ -365,7 +374,7 @@ def export_cards(
     end = date.fromisoformat(date_to) if date_to else today
 
     halqa = _resolve_halqa(user, db, halqa_id)
-    members = _get_members(db, halqa)
+    members = _get_members(db, halqa, options=(joinedload(User.halqa),))
 
     # Apply search filters
     if search_name:
@@ -376,15 +385,21 @@ def export_cards(
         match_set = male_values if search_gender == "male" else female_values
         members = [m for m in members if m.gender in match_set]
 
-    gender_map = {"male": "ذكر", "female": "أنثى"}
-    rows = []
-    for member in members:
-        cards = db.query(DailyCard).filter(
-            DailyCard.user_id == member.id,
+    # Fetch the cards of all selected members in one query, grouped per member
+    cards_by_user = defaultdict(list)
+    member_ids = [m.id for m in members]
+    if member_ids:
+        for c in db.query(DailyCard).filter(
+            DailyCard.user_id.in_(member_ids),
             DailyCard.date >= start,
             DailyCard.date <= end,
-        ).order_by(DailyCard.date).all()
+        ).order_by(DailyCard.date):
+            cards_by_user[c.user_id].append(c)
 
+    gender_map = {"male": "ذكر", "female": "أنثى"}
+    rows = []
+    for member in members:
+        cards = cards_by_user.get(member.id, [])
         halqa_name = member.halqa.name if member.halqa else "-"
         for c in cards:
             rows.append({
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.halqa import Halqa
 
 
 class HalqaCreate(BaseModel):
@@ -16,6 +18,14 @@ class AssignMembers(BaseModel):
     user_ids: list[int] = []
 
 
+# Loader options for halqa list queries: prefetch the supervisor and members
+# read by halqa_to_response() instead of lazy-loading them per halqa.
+HALQA_RESPONSE_OPTIONS = (
+    joinedload(Halqa.supervisor),
+    selectinload(Halqa.members),
+)
+
+
 def halqa_to_response(halqa) -> dict:
     """Build halqa response dict matching the frontend expected format."""
     active_members = [m for m in halqa.members if m.status == "active"]
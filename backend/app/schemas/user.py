@@ -1,5 +1,8 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.user import User
+from app.models.halqa import Halqa
 
 
 # --- Request Schemas ---
@@ -75,6 +78,14 @@ class RejectRegistration(BaseModel):
 # --- Response Helpers ---
 
 
+# Loader options for user list queries: prefetch every relationship that
+# user_to_response() touches so a list of N users doesn't lazy-load per row.
+USER_RESPONSE_OPTIONS = (
+    joinedload(User.halqa).joinedload(Halqa.supervisor),
+    selectinload(User.supervised_halqa),
+)
+
+
 def user_to_response(user) -> dict:
     """Build user response dict matching the frontend expected format."""
     data = {
@@ -1,8 +1,11 @@
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def _send_email(to: str, subject: str, html_body: str):
     """Send email via SMTP."""
@@ -22,7 +25,7 @@ def _send_email(to: str, subject: str, html_body: str):
             server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
             server.send_message(msg)
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.warning("Failed to send email: %s", e)
 
 
 def send_new_registration_email(user_data: dict):
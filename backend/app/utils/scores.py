@@ -0,0 +1,27 @@
+from sqlalchemy import func
+from app.models.daily_card import DailyCard
+
+
+def score_totals_by_user(db, user_ids, start=None, end=None) -> dict:
+    """Sum card scores per user in SQL.
+
+    Returns {user_id: (total_score, cards_count)} for users that have cards
+    in the optional [start, end] date range; users without cards are absent.
+    """
+    if not user_ids:
+        return {}
+
+    query = db.query(
+        DailyCard.user_id,
+        func.sum(DailyCard.total_score),
+        func.count(DailyCard.id),
+    ).filter(DailyCard.user_id.in_(user_ids))
+    if start:
+        query = query.filter(DailyCard.date >= start)
+    if end:
+        query = query.filter(DailyCard.date <= end)
+
+    return {
+        user_id: (total, cards_count)
+        for user_id, total, cards_count in query.group_by(DailyCard.user_id)
+    }
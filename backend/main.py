@@ -3,7 +3,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse, FileResponse
-from sqlalchemy import text, inspect
+from sqlalchemy import text, inspect, select
 from app.database import engine, Base, SessionLocal
 from app.routes import all_routers
 from app.models import User, DailyCard, Halqa, SiteSettings  
@@ -111,57 +111,78 @@ for router in all_routers:
     app.include_router(router)
 
 
+# Columns added to existing tables after the first release: table -> [(column, DDL)]
+COLUMN_MIGRATIONS = {
+    "users": [("member_id", "INTEGER UNIQUE")],
+    "halqas": [("updated_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP")],
+    "daily_cards": [
+        ("tadabbur", "DOUBLE PRECISION DEFAULT 0"),
+        ("adhkar", "DOUBLE PRECISION DEFAULT 0"),
+    ],
+}
+
+
 # Startup: create tables and default settings
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-
-    # Migrate: add member_id column if missing
+    # create_all probes every table one by one; skip it when they all exist
     inspector = inspect(engine)
-    columns = [c["name"] for c in inspector.get_columns("users")]
-    if "member_id" not in columns:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE users ADD COLUMN member_id INTEGER UNIQUE"))
-
-    # Migrate: add updated_at column to halqas if missing
-    halqa_columns = [c["name"] for c in inspector.get_columns("halqas")]
-    if "updated_at" not in halqa_columns:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE halqas ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
-
-    # Migrate: add tadabbur column to daily_cards if missing
-    daily_card_columns = [c["name"] for c in inspector.get_columns("daily_cards")]
-    if "tadabbur" not in daily_card_columns:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE daily_cards ADD COLUMN tadabbur DOUBLE PRECISION DEFAULT 0"))
-
-    # Migrate: add adhkar column to daily_cards if missing
-    if "adhkar" not in daily_card_columns:
-        with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE daily_cards ADD COLUMN adhkar DOUBLE PRECISION DEFAULT 0"))
+    missing_tables = set(Base.metadata.tables) - set(inspector.get_table_names())
+    if missing_tables:
+        Base.metadata.create_all(bind=engine)
+
+    # Migrate: add missing columns, one multi-clause ALTER TABLE per table.
+    # Freshly created tables already have every column, so only pre-existing
+    # ones are reflected, all in one batched query.
+    migrated_tables = [t for t in COLUMN_MIGRATIONS if t not in missing_tables]
+    if migrated_tables:
+        table_columns = inspector.get_multi_columns(filter_names=migrated_tables)
+        for table in migrated_tables:
+            existing = {c["name"] for c in table_columns[(None, table)]}
+            missing = [
+                f"ADD COLUMN {name} {ddl}"
+                for name, ddl in COLUMN_MIGRATIONS[table]
+                if name not in existing
+            ]
+            if missing:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} {', '.join(missing)}"))
 
     db = SessionLocal()
     try:
-        if not db.query(SiteSettings).first():
+        admin_email = app_settings.SUPER_ADMIN_EMAIL.lower()
+
+        # Check for site settings and the super admin in one round trip
+        settings_id, admin_id = db.execute(
+            select(
+                select(SiteSettings.id).limit(1).scalar_subquery(),
+                select(User.id).where(User.email == admin_email).scalar_subquery(),
+            )
+        ).one()
+
+        if settings_id is None:
             db.add(SiteSettings(enable_email_notifications=True))
             db.commit()
 
-        # Backfill member_id for existing users without one
-        users_without = db.query(User).filter(User.member_id.is_(None)).order_by(User.id).all()
-        if users_without:
-            from sqlalchemy import func
-            max_mid = db.query(func.max(User.member_id)).scalar()
-            next_id = (max_mid + 1) if max_mid else 1000
-            for u in users_without:
-                u.member_id = next_id
-                next_id += 1
+        # Backfill member_id for existing users without one, numbering them in
+        # id order after the current maximum (starting at 1000) in one UPDATE
+        backfilled = db.execute(text("""
+            UPDATE users SET member_id = numbered.new_id
+            FROM (
+                SELECT id,
+                       (SELECT COALESCE(MAX(member_id), 999) FROM users)
+                       + ROW_NUMBER() OVER (ORDER BY id) AS new_id
+                FROM users
+                WHERE member_id IS NULL
+            ) AS numbered
+            WHERE users.id = numbered.id
+        """)).rowcount
+        if backfilled:
             db.commit()
-            print(f"Backfilled member_id for {len(users_without)} users")
+            logger.info("Backfilled member_id for %d users", backfilled)
 
         # Auto-create super admin if not exists
-        admin_email = app_settings.SUPER_ADMIN_EMAIL.lower()
-        admin = db.query(User).filter_by(email=admin_email).first()
-        if not admin:
+        if admin_id is None:
             admin = User(
                 full_name="Super Admin",
                 gender="male",
@@ -175,7 +196,7 @@ def on_startup():
             admin.set_password(app_settings.SUPER_ADMIN_PASSWORD)
             db.add(admin)
             db.commit()
-            print(f"Super admin created: {admin_email}")
+            logger.info("Super admin created: %s", admin_email)
     finally:
         db.close()
 